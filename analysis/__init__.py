@@ -0,0 +1,3 @@
+"""
+Code analysis tools for Python projects.
+"""
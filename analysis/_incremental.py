@@ -0,0 +1,130 @@
+"""
+Incremental Analysis Cache
+Persists per-file results keyed by content hash so unchanged files are skipped.
+"""
+
+import dataclasses
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+try:
+    from ._source import MMAP_THRESHOLD
+    from ._parallel import map_files
+except ImportError:
+    from _source import MMAP_THRESHOLD  # type: ignore
+    from _parallel import map_files  # type: ignore
+
+DEFAULT_CACHE_PATH = '.analysis-cache.sqlite'
+
+# Bump whenever analyzer logic changes so results from older versions are discarded
+CACHE_VERSION = 2
+
+
+def file_digest(file_path: str) -> str:
+    """Return the SHA-1 hex digest of a file's contents."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha1(mm).hexdigest()
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class ResultCache:
+    """SQLite store of analysis results keyed by (kind, path) and content digest."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.conn = sqlite3.connect(path)
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version != CACHE_VERSION:
+            self.conn.execute('DROP TABLE IF EXISTS results')
+            self.conn.execute(f'PRAGMA user_version = {CACHE_VERSION}')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS results ('
+            'kind TEXT NOT NULL, path TEXT NOT NULL, digest TEXT NOT NULL, '
+            'payload TEXT NOT NULL, PRIMARY KEY (kind, path))'
+        )
+        self.conn.commit()
+
+    def get(self, kind: str, file_path: str, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the stored result fields, or None if missing or stale."""
+        row = self.conn.execute(
+            'SELECT payload FROM results WHERE kind = ? AND path = ? AND digest = ?',
+            (kind, file_path, digest)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind: str, file_path: str, digest: str, fields: Dict[str, Any]) -> None:
+        """Store result fields, replacing any earlier entry for the file."""
+        self.conn.execute(
+            'INSERT OR REPLACE INTO results (kind, path, digest, payload) VALUES (?, ?, ?, ?)',
+            (kind, file_path, digest, json.dumps(fields))
+        )
+
+    def commit(self) -> None:
+        """Flush pending writes."""
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self) -> 'ResultCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def map_files_incremental(func: Callable[[str], Any], file_paths: List[str],
+                          result_type: Type, cache: Optional[ResultCache],
+                          max_workers: Optional[int] = None
+                          ) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """Like map_files, but reuse cached results for files whose content is unchanged.
+
+    result_type is the dataclass func returns; its name keys the cache so
+    different analyzers do not collide. Results are yielded in input order,
+    with cached entries interleaved among freshly analyzed files.
+    """
+    if cache is None:
+        yield from map_files(func, file_paths, max_workers)
+        return
+
+    kind = result_type.__name__
+    digests = {}
+    hits = {}
+    misses = []
+
+    for file_path in file_paths:
+        try:
+            digest = file_digest(file_path)
+        except OSError:
+            misses.append(file_path)
+            continue
+
+        fields = cache.get(kind, file_path, digest)
+        if fields is None:
+            digests[file_path] = digest
+            misses.append(file_path)
+        else:
+            hits[file_path] = result_type(**fields)
+
+    # map_files yields misses in the order given, so they can be merged back in step
+    fresh = map_files(func, misses, max_workers)
+    try:
+        for file_path in file_paths:
+            if file_path in hits:
+                yield file_path, hits[file_path], None
+                continue
+
+            file_path, result, error = next(fresh)
+            if error is None and file_path in digests:
+                cache.put(kind, file_path, digests[file_path], dataclasses.asdict(result))
+            yield file_path, result, error
+    finally:
+        fresh.close()
+        cache.commit()
@@ -0,0 +1,44 @@
+"""
+Parallel File Analysis
+Fans per-file analysis out across worker processes for the project analyzers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Generator, List, Optional, Tuple
+
+
+def _call_safely(func: Callable[[str], Any], file_path: str) -> Tuple[Any, Optional[str]]:
+    """Run func on a file, returning (result, None) or (None, error message)."""
+    try:
+        return func(file_path), None
+    except Exception as e:
+        return None, str(e)
+
+
+def map_files(func: Callable[[str], Any], file_paths: List[str],
+              max_workers: Optional[int] = None
+              ) -> Generator[Tuple[str, Any, Optional[str]], None, None]:
+    """Apply func to each file in worker processes.
+
+    Yields (file_path, result, error) in input order; error is None on success.
+    func must be picklable, i.e. a module-level function or a bound method of
+    a picklable object. Runs in-process when only one worker would be used.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    call = partial(_call_safely, func)
+
+    if workers == 1 or len(file_paths) <= 1:
+        for file_path in file_paths:
+            result, error = call(file_path)
+            yield file_path, result, error
+        return
+
+    # Batch files per task to amortize pickling; ~4 batches per worker
+    chunksize = max(1, len(file_paths) // (workers * 4))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(call, file_paths, chunksize=chunksize)
+        for file_path, (result, error) in zip(file_paths, outcomes):
+            yield file_path, result, error
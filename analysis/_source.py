@@ -0,0 +1,42 @@
+"""
+Source Loading for Analyzers
+Reads and parses a source file once so composed analyzers can share the result.
+"""
+
+import ast
+import mmap
+import os
+from typing import Optional, Tuple
+
+# Files at least this large are memory-mapped rather than read into a bytes copy
+MMAP_THRESHOLD = 64 * 1024
+
+# (content, tree) for a file; tree is None when the file does not parse
+Source = Tuple[str, Optional[ast.AST]]
+
+
+def read_source(file_path: str) -> Source:
+    """Read and parse a file, returning (content, tree).
+
+    Pass the result to several per-file analyzers to share one read and
+    parse between them. Nothing is retained after the caller drops it.
+    """
+    # Binary read decoded in one call rather than through the incremental
+    # text-mode decoder; large files decode straight from the page cache
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+        else:
+            content = f.read().decode('utf-8')
+
+    # Apply the universal-newline translation text mode used to do
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        tree = None
+
+    return content, tree
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Combined Analyzer for Python Code
+Computes complexity metrics and security issues in a single AST traversal.
+"""
+
+import ast
+from typing import List, Tuple
+
+try:
+    from ._source import read_source
+    from .complexity_analyzer import ComplexityMetrics, build_metrics
+    from .security_analyzer import SecurityAnalyzer, SecurityIssue, generate_security_report
+except ImportError:
+    from _source import read_source  # type: ignore
+    from complexity_analyzer import ComplexityMetrics, build_metrics  # type: ignore
+    from security_analyzer import SecurityAnalyzer, SecurityIssue, generate_security_report  # type: ignore
+
+
+class CombinedAnalyzer(SecurityAnalyzer):
+    """Security visitor that runs inside the complexity walk.
+
+    The security visit_* methods are handed to analyze_tree as per-node
+    handlers, so the tree is traversed once and complexity is computed by
+    the same rules as analyze_file_complexity.
+    """
+
+    def generic_visit(self, node: ast.AST) -> None:
+        """Do nothing; analyze_tree already descends into every node."""
+
+    def run(self, tree: ast.AST) -> Tuple[ComplexityMetrics, List[SecurityIssue]]:
+        """Walk the tree once and return complexity metrics and security issues."""
+        handlers = {
+            getattr(ast, name[len('visit_'):]): getattr(self, name)
+            for name in dir(self)
+            if name.startswith('visit_') and hasattr(ast, name[len('visit_'):])
+        }
+        return build_metrics(tree, self.content, handlers), self.issues
+
+
+def analyze_file_combined(file_path: str) -> Tuple[ComplexityMetrics, List[SecurityIssue]]:
+    """Analyze complexity and security of a Python file in a single pass."""
+    content, tree = read_source(file_path)
+
+    if tree is None:
+        return ComplexityMetrics(0, 0, 0.0, 0.0, 0, 0, 0), []
+
+    return CombinedAnalyzer(content).run(tree)
+
+
+if __name__ == "__main__":
+    import sys
+    import os
+
+    if len(sys.argv) != 2:
+        print("Usage: python combined_analyzer.py <file_path>")
+        sys.exit(1)
+
+    file_path = sys.argv[1]
+
+    if not os.path.isfile(file_path):
+        print(f"Error: File {file_path} does not exist")
+        sys.exit(1)
+
+    metrics, issues = analyze_file_combined(file_path)
+    print(f"Complexity Analysis for {file_path}:")
+    print(f"  Cyclomatic Complexity: {metrics.cyclomatic_complexity} ({metrics.get_complexity_rating()})")
+    print(f"  Cognitive Complexity: {metrics.cognitive_complexity}")
+    print(f"  Lines of Code: {metrics.lines_of_code}")
+    print(f"  Functions: {metrics.num_functions}")
+    print(f"  Classes: {metrics.num_classes}")
+    print(f"  Maintainability Index: {metrics.maintainability_index:.2f}")
+    print()
+    print(generate_security_report(issues))
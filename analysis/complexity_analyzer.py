@@ -6,10 +6,23 @@ Analyzes cyclomatic complexity, cognitive complexity, and other metrics.
 
 import ast
 import os
-from typing import Dict, List, Tuple
+import re
+from typing import Callable, Collection, Dict, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from ._source import Source, read_source
+    from ._incremental import ResultCache, map_files_incremental
+    from ._walk import DEFAULT_EXCLUDE, iter_source_files
+except ImportError:
+    from _source import Source, read_source  # type: ignore
+    from _incremental import ResultCache, map_files_incremental  # type: ignore
+    from _walk import DEFAULT_EXCLUDE, iter_source_files  # type: ignore
+
+# Start of a line whose first non-whitespace character is not a comment
+_CODE_LINE_RE = re.compile(r'^[^\S\n]*[^\s#]', re.MULTILINE)
+
 
 class ComplexityType(Enum):
     """Types of complexity analysis."""
@@ -19,7 +32,7 @@ class ComplexityType(Enum):
     MAINTAINABILITY = "maintainability"
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplexityMetrics:
     """Container for complexity metrics."""
     cyclomatic_complexity: int
@@ -42,128 +55,146 @@ class ComplexityMetrics:
             return "Very High"
 
 
-class ComplexityAnalyzer(ast.NodeVisitor):
-    """AST visitor for analyzing code complexity."""
-    
-    def __init__(self):
-        self.complexity = 1  # Base complexity
-        self.cognitive_complexity = 0
-        self.nesting_level = 0
-        self.halstead_operators = []
-        self.halstead_operands = []
-        self.functions = []
-        self.classes = []
-    
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        """Visit function definition."""
-        self.functions.append(node.name)
-        old_complexity = self.complexity
-        old_cognitive = self.cognitive_complexity
-        self.complexity = 1  # Reset for function
-        self.cognitive_complexity = 0
+def analyze_tree(tree: ast.AST,
+                 handlers: Optional[Mapping[type, Callable[[ast.AST], None]]] = None
+                 ) -> Tuple[int, int, int, int]:
+    """Compute (cyclomatic, cognitive, num_functions, num_classes) for a tree.
+    
+    Walks the tree with an explicit stack and dispatches on node type inline
+    instead of going through NodeVisitor's per-node method lookup. handlers
+    maps node types to callbacks run on each matching node during the same
+    walk; nodes are visited in the same order as NodeVisitor.visit.
+    """
+    complexity = 1  # Base complexity
+    cognitive = 0
+    num_functions = 0
+    num_classes = 0
+    stack: List[Tuple[ast.AST, int]] = [(tree, 0)]
+    
+    while stack:
+        node, nesting = stack.pop()
+        node_type = type(node)
         
-        self.generic_visit(node)
+        if handlers is not None:
+            handler = handlers.get(node_type)
+            if handler is not None:
+                handler(node)
         
-        # Store function complexity
-        func_complexity = self.complexity
-        func_cognitive = self.cognitive_complexity
+        if node_type is ast.If or node_type is ast.For or node_type is ast.While:
+            complexity += 1
+            cognitive += 1 + nesting
+            nesting += 1
+        elif isinstance(node, ast.Try):
+            complexity += len(node.handlers) + len(node.orelse) + len(node.finalbody)
+            cognitive += 1 + nesting
+            nesting += 1
+        elif isinstance(node, ast.BoolOp):
+            complexity += len(node.values) - 1
+            cognitive += len(node.values) - 1
+        elif node_type is ast.FunctionDef:
+            # Each function contributes its own base complexity
+            complexity += 1
+            num_functions += 1
+        elif node_type is ast.ClassDef:
+            num_classes += 1
         
-        # Restore previous complexity
-        self.complexity = old_complexity + func_complexity
-        self.cognitive_complexity = old_cognitive + func_cognitive
-    
-    def visit_ClassDef(self, node: ast.ClassDef) -> None:
-        """Visit class definition."""
-        self.classes.append(node.name)
-        self.generic_visit(node)
-    
-    def visit_If(self, node: ast.If) -> None:
-        """Visit if statement."""
-        self.complexity += 1
-        self.cognitive_complexity += 1 + self.nesting_level
-        self.nesting_level += 1
-        self.generic_visit(node)
-        self.nesting_level -= 1
-    
-    def visit_While(self, node: ast.While) -> None:
-        """Visit while loop."""
-        self.complexity += 1
-        self.cognitive_complexity += 1 + self.nesting_level
-        self.nesting_level += 1
-        self.generic_visit(node)
-        self.nesting_level -= 1
-    
-    def visit_For(self, node: ast.For) -> None:
-        """Visit for loop."""
-        self.complexity += 1
-        self.cognitive_complexity += 1 + self.nesting_level
-        self.nesting_level += 1
-        self.generic_visit(node)
-        self.nesting_level -= 1
-    
-    def visit_Try(self, node: ast.Try) -> None:
-        """Visit try statement."""
-        self.complexity += len(node.handlers) + len(node.orelse) + len(node.finalbody)
-        self.cognitive_complexity += 1 + self.nesting_level
-        self.nesting_level += 1
-        self.generic_visit(node)
-        self.nesting_level -= 1
-    
-    def visit_BoolOp(self, node: ast.BoolOp) -> None:
-        """Visit boolean operation."""
-        self.complexity += len(node.values) - 1
-        self.cognitive_complexity += len(node.values) - 1
-        self.generic_visit(node)
-
-
-def analyze_file_complexity(file_path: str) -> ComplexityMetrics:
-    """Analyze complexity of a Python file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    try:
-        tree = ast.parse(content)
-    except SyntaxError:
-        return ComplexityMetrics(0, 0, 0.0, 0.0, 0, 0, 0)
+        # Inlined ast.iter_child_nodes, which is a comparatively slow generator.
+        # Children are pushed last-first so they are popped in source order.
+        for field in reversed(node._fields):
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in reversed(value):
+                    if isinstance(item, ast.AST):
+                        stack.append((item, nesting))
+            elif isinstance(value, ast.AST):
+                stack.append((value, nesting))
+    
+    return complexity, cognitive, num_functions, num_classes
+
+
+def analyze_file_complexity(file_path: str, source: Optional[Source] = None) -> ComplexityMetrics:
+    """Analyze complexity of a Python file.
     
-    analyzer = ComplexityAnalyzer()
-    analyzer.visit(tree)
+    Pass source, as returned by read_source(), to reuse an existing parse.
+    """
+    content, tree = source if source is not None else read_source(file_path)
     
-    lines = content.split('\n')
-    lines_of_code = len([line for line in lines if line.strip() and not line.strip().startswith('#')])
+    if tree is None:
+        return ComplexityMetrics(0, 0, 0.0, 0.0, 0, 0, 0)
     
-    # Calculate Halstead volume (simplified)
-    halstead_volume = len(analyzer.halstead_operators) + len(analyzer.halstead_operands)
+    return build_metrics(tree, content)
+
+
+def count_code_lines(content: str) -> int:
+    """Count lines that are neither blank nor comment-only."""
+    return sum(1 for _ in _CODE_LINE_RE.finditer(content))
+
+
+def build_metrics(tree: ast.AST, content: str,
+                  handlers: Optional[Mapping[type, Callable[[ast.AST], None]]] = None
+                  ) -> ComplexityMetrics:
+    """Build file metrics from a parsed tree and the source it came from.
+    
+    handlers is passed through to analyze_tree.
+    """
+    complexity, cognitive, num_functions, num_classes = analyze_tree(tree, handlers)
+    lines_of_code = count_code_lines(content)
     
     # Calculate maintainability index (simplified formula)
-    maintainability = max(0, 171 - 5.2 * analyzer.complexity - 0.23 * lines_of_code)
+    maintainability = max(0, 171 - 5.2 * complexity - 0.23 * lines_of_code)
     
     return ComplexityMetrics(
-        cyclomatic_complexity=analyzer.complexity,
-        cognitive_complexity=analyzer.cognitive_complexity,
-        halstead_volume=halstead_volume,
+        cyclomatic_complexity=complexity,
+        cognitive_complexity=cognitive,
+        halstead_volume=0.0,  # Halstead operators/operands are not tracked
         maintainability_index=maintainability,
         lines_of_code=lines_of_code,
-        num_functions=len(analyzer.functions),
-        num_classes=len(analyzer.classes)
+        num_functions=num_functions,
+        num_classes=num_classes
     )
 
 
-def analyze_project_complexity(project_path: str) -> Dict[str, ComplexityMetrics]:
-    """Analyze complexity for all Python files in a project."""
-    results = {}
-    
-    for root, dirs, files in os.walk(project_path):
-        for file in files:
-            if file.endswith('.py'):
-                file_path = os.path.join(root, file)
-                try:
-                    metrics = analyze_file_complexity(file_path)
-                    results[file_path] = metrics
-                except Exception as e:
-                    print(f"Error analyzing {file_path}: {e}")
+def iter_project_complexity(project_path: str, max_workers: Optional[int] = None,
+                            errors: Optional[List[Tuple[str, str]]] = None,
+                            exclude: Collection[str] = DEFAULT_EXCLUDE,
+                            cache: Optional[ResultCache] = None
+                            ) -> Iterator[Tuple[str, ComplexityMetrics]]:
+    """Yield (file_path, metrics) for each Python file in a project as it is analyzed.
+    
+    Directories named in exclude (by default VCS, virtualenv, cache and
+    build directories) are skipped. Files are analyzed in parallel across
+    max_workers processes (default: one per CPU). Files that fail are
+    skipped and recorded in errors as (file_path, message) if a list is
+    given; otherwise they are reported together on stdout once the walk
+    completes. With a cache, files whose content is unchanged since the
+    last run reuse their stored metrics.
+    """
+    file_paths = list(iter_source_files(project_path, exclude=exclude))
+    outcomes = map_files_incremental(analyze_file_complexity, file_paths,
+                                     ComplexityMetrics, cache, max_workers)
+    failures = errors if errors is not None else []
+    
+    for file_path, metrics, error in outcomes:
+        if error is None:
+            yield file_path, metrics
+        else:
+            failures.append((file_path, error))
     
-    return results
+    if errors is None and failures:
+        print("\n".join(f"Error analyzing {file_path}: {error}" for file_path, error in failures))
+
+
+def analyze_project_complexity(project_path: str, max_workers: Optional[int] = None,
+                               errors: Optional[List[Tuple[str, str]]] = None,
+                               exclude: Collection[str] = DEFAULT_EXCLUDE,
+                               cache: Optional[ResultCache] = None
+                               ) -> Dict[str, ComplexityMetrics]:
+    """Analyze complexity for all Python files in a project.
+    
+    Failures are handled as in iter_project_complexity: recorded in errors
+    if a list is given, otherwise reported once at the end.
+    """
+    return dict(iter_project_complexity(project_path, max_workers, errors, exclude, cache))
 
 
 if __name__ == "__main__":
@@ -185,13 +216,17 @@ if __name__ == "__main__":
         print(f"  Classes: {metrics.num_classes}")
         print(f"  Maintainability Index: {metrics.maintainability_index:.2f}")
     elif os.path.isdir(path):
-        results = analyze_project_complexity(path)
+        errors: List[Tuple[str, str]] = []
         print(f"Project Complexity Analysis for {path}:")
-        for file_path, metrics in results.items():
-            print(f"\n{file_path}:")
-            print(f"  Complexity: {metrics.cyclomatic_complexity} ({metrics.get_complexity_rating()})")
-            print(f"  Cognitive: {metrics.cognitive_complexity}")
-            print(f"  Lines: {metrics.lines_of_code}")
+        with ResultCache() as cache:
+            for file_path, metrics in iter_project_complexity(path, errors=errors, cache=cache):
+                print(f"\n{file_path}:")
+                print(f"  Complexity: {metrics.cyclomatic_complexity} ({metrics.get_complexity_rating()})")
+                print(f"  Cognitive: {metrics.cognitive_complexity}")
+                print(f"  Lines: {metrics.lines_of_code}", flush=True)
+        if errors:
+            print("\nErrors:")
+            print("\n".join(f"  {file_path}: {error}" for file_path, error in errors))
     else:
         print(f"Error: {path} is not a valid file or directory")
         sys.exit(1)
@@ -6,10 +6,38 @@ Scans for common security vulnerabilities and patterns.
 
 import ast
 import re
-from typing import List, Dict, Set
+from array import array
+from collections import defaultdict
+from typing import List, Dict, Optional, Set
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from ._source import Source, read_source
+except ImportError:
+    from _source import Source, read_source  # type: ignore
+
+# Modules whose import is flagged, with the reason
+_DANGEROUS_IMPORTS = {
+    'pickle': 'Pickle can execute arbitrary code during deserialization',
+    'subprocess': 'Subprocess can lead to command injection vulnerabilities',
+    'eval': 'Direct eval usage can execute arbitrary code',
+    'exec': 'Direct exec usage can execute arbitrary code'
+}
+
+# Hardcoded credential assignments inside string literals
+_CREDENTIAL_RE = re.compile(
+    r'(?:password\s*=\s*["\'][^"\'\n]{3,}'
+    r'|(?:api_key|secret|token)\s*=\s*["\'][^"\'\n]{10,})["\']',
+    re.IGNORECASE
+)
+
+# SQL statement keywords
+_SQL_KEYWORDS = re.compile(r'\b(?:select|insert|update|delete|drop|create) ', re.IGNORECASE)
+
+# Shortest string literal any check can match: "drop "
+_MIN_LITERAL_LENGTH = 5
+
 
 class SecuritySeverity(Enum):
     """Security issue severity levels."""
@@ -19,7 +47,12 @@ class SecuritySeverity(Enum):
     CRITICAL = "Critical"
 
 
-@dataclass
+# Order in which severities are listed in reports, most severe first
+_SEVERITY_ORDER = (SecuritySeverity.CRITICAL, SecuritySeverity.HIGH,
+                   SecuritySeverity.MEDIUM, SecuritySeverity.LOW)
+
+
+@dataclass(slots=True)
 class SecurityIssue:
     """Container for security issues."""
     rule_id: str
@@ -33,15 +66,36 @@ class SecurityIssue:
 class SecurityAnalyzer(ast.NodeVisitor):
     """AST visitor for security analysis."""
     
-    def __init__(self, source_lines: List[str]):
+    def __init__(self, content: str):
         self.issues: List[SecurityIssue] = []
-        self.source_lines = source_lines
+        self.content = content
         self.imports: Set[str] = set()
+        self._line_starts: Optional[array] = None
+    
+    def get_line(self, line_number: int) -> str:
+        """Return a 1-based source line, or "" if out of range."""
+        content = self.content
+        
+        # Offsets of line starts, computed once on first use
+        if self._line_starts is None:
+            starts = array('L', [0])
+            pos = content.find('\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = content.find('\n', pos + 1)
+            self._line_starts = starts
+        
+        if not 1 <= line_number <= len(self._line_starts):
+            return ""
+        
+        start = self._line_starts[line_number - 1]
+        end = content.find('\n', start)
+        return content[start:end] if end != -1 else content[start:]
     
     def add_issue(self, rule_id: str, severity: SecuritySeverity, 
                   description: str, line_number: int, recommendation: str):
         """Add a security issue."""
-        code_snippet = self.source_lines[line_number - 1] if line_number <= len(self.source_lines) else ""
+        code_snippet = self.get_line(line_number)
         issue = SecurityIssue(
             rule_id=rule_id,
             severity=severity,
@@ -58,18 +112,11 @@ class SecurityAnalyzer(ast.NodeVisitor):
             self.imports.add(alias.name)
             
             # Check for dangerous imports
-            dangerous_imports = {
-                'pickle': 'Pickle can execute arbitrary code during deserialization',
-                'subprocess': 'Subprocess can lead to command injection vulnerabilities',
-                'eval': 'Direct eval usage can execute arbitrary code',
-                'exec': 'Direct exec usage can execute arbitrary code'
-            }
-            
-            if alias.name in dangerous_imports:
+            if alias.name in _DANGEROUS_IMPORTS:
                 self.add_issue(
                     f"dangerous_import_{alias.name}",
                     SecuritySeverity.HIGH,
-                    f"Dangerous import: {dangerous_imports[alias.name]}",
+                    f"Dangerous import: {_DANGEROUS_IMPORTS[alias.name]}",
                     node.lineno,
                     f"Review usage of {alias.name} and consider safer alternatives"
                 )
@@ -126,37 +173,28 @@ class SecurityAnalyzer(ast.NodeVisitor):
         
         self.generic_visit(node)
     
-    def visit_Str(self, node: ast.Str) -> None:
+    def visit_Constant(self, node: ast.Constant) -> None:
         """Check string literals for security issues."""
-        value = node.s.lower()
+        value = node.value
         
-        # Check for hardcoded credentials patterns
-        credential_patterns = [
-            r'password\s*=\s*["\'][^"\'
-]{3,}["\']',
-            r'api_key\s*=\s*["\'][^"\'
-]{10,}["\']',
-            r'secret\s*=\s*["\'][^"\'
-]{10,}["\']',
-            r'token\s*=\s*["\'][^"\'
-]{10,}["\']'
-        ]
+        # Only strings can match, and none shorter than the shortest keyword
+        if not isinstance(value, str) or len(value) < _MIN_LITERAL_LENGTH:
+            self.generic_visit(node)
+            return
         
-        for pattern in credential_patterns:
-            if re.search(pattern, value, re.IGNORECASE):
-                self.add_issue(
-                    "hardcoded_credentials",
-                    SecuritySeverity.HIGH,
-                    "Potential hardcoded credentials in string literal",
-                    node.lineno,
-                    "Use environment variables or secure config files for credentials"
-                )
-                break
+        # Check for hardcoded credentials patterns
+        if _CREDENTIAL_RE.search(value):
+            self.add_issue(
+                "hardcoded_credentials",
+                SecuritySeverity.HIGH,
+                "Potential hardcoded credentials in string literal",
+                node.lineno,
+                "Use environment variables or secure config files for credentials"
+            )
         
         # Check for SQL injection keywords
-        sql_keywords = ['select ', 'insert ', 'update ', 'delete ', 'drop ', 'create ']
-        if any(keyword in value for keyword in sql_keywords):
-            if '%s' in value or '.format(' in self.source_lines[node.lineno - 1]:
+        if _SQL_KEYWORDS.search(value):
+            if '%s' in value or '.format(' in self.get_line(node.lineno):
                 self.add_issue(
                     "sql_injection_string",
                     SecuritySeverity.MEDIUM,
@@ -168,18 +206,17 @@ class SecurityAnalyzer(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def analyze_file_security(file_path: str) -> List[SecurityIssue]:
-    """Analyze security issues in a Python file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def analyze_file_security(file_path: str, source: Optional[Source] = None) -> List[SecurityIssue]:
+    """Analyze security issues in a Python file.
+    
+    Pass source, as returned by read_source(), to reuse an existing parse.
+    """
+    content, tree = source if source is not None else read_source(file_path)
     
-    try:
-        tree = ast.parse(content)
-    except SyntaxError:
+    if tree is None:
         return []
     
-    source_lines = content.split('\n')
-    analyzer = SecurityAnalyzer(source_lines)
+    analyzer = SecurityAnalyzer(content)
     analyzer.visit(tree)
     
     return analyzer.issues
@@ -190,34 +227,30 @@ def generate_security_report(issues: List[SecurityIssue]) -> str:
     if not issues:
         return "No security issues found."
     
-    report = "Security Analysis Report\n"
-    report += "=" * 25 + "\n\n"
+    parts = ["Security Analysis Report\n", "=" * 25 + "\n\n"]
     
     # Group by severity
-    severity_groups = {}
+    severity_groups = defaultdict(list)
     for issue in issues:
-        if issue.severity not in severity_groups:
-            severity_groups[issue.severity] = []
         severity_groups[issue.severity].append(issue)
     
-    for severity in [SecuritySeverity.CRITICAL, SecuritySeverity.HIGH, 
-                    SecuritySeverity.MEDIUM, SecuritySeverity.LOW]:
+    for severity in _SEVERITY_ORDER:
         if severity in severity_groups:
-            report += f"\n{severity.value} Severity Issues:\n"
-            report += "-" * (len(severity.value) + 17) + "\n"
+            parts.append(f"\n{severity.value} Severity Issues:\n")
+            parts.append("-" * (len(severity.value) + 17) + "\n")
             
             for issue in severity_groups[severity]:
-                report += f"\nLine {issue.line_number}: {issue.description}\n"
-                report += f"  Code: {issue.code_snippet}\n"
-                report += f"  Recommendation: {issue.recommendation}\n"
+                parts.append(f"\nLine {issue.line_number}: {issue.description}\n")
+                parts.append(f"  Code: {issue.code_snippet}\n")
+                parts.append(f"  Recommendation: {issue.recommendation}\n")
     
     # Summary
-    report += f"\n\nSummary:\n"
-    report += f"Total Issues: {len(issues)}\n"
-    for severity in severity_groups:
-        report += f"{severity.value}: {len(severity_groups[severity])}\n"
+    parts.append(f"\n\nSummary:\n")
+    parts.append(f"Total Issues: {len(issues)}\n")
+    for severity, group in severity_groups.items():
+        parts.append(f"{severity.value}: {len(group)}\n")
     
-    return report
+    return "".join(parts)
 
 
 if __name__ == "__main__":
@@ -3,15 +3,37 @@ Advanced Python code file for testing Bifrost MCP coding analysis features.
 This file contains various Python constructs to test language analysis.
 """
 
+import ast
 import json
 import os
+import re
 import sys
-from typing import List, Dict, Optional, Union
+from typing import Collection, List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
-@dataclass
+from analysis._source import Source, read_source
+from analysis._incremental import ResultCache, map_files_incremental
+from analysis._walk import DEFAULT_EXCLUDE, iter_source_files
+
+# Start of a line containing any non-whitespace character
+_NONBLANK_LINE_RE = re.compile(r'^[^\S\n]*\S', re.MULTILINE)
+
+# Node types that add a branch to PythonAnalyzer's complexity score
+_CONTROL_NODES = (ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler, ast.BoolOp)
+
+
+def _source_position(node: ast.stmt) -> tuple:
+    """Sort key placing AST nodes in source order."""
+    return (node.lineno, node.col_offset)
+
+
+@dataclass(slots=True)
 class AnalysisResult:
     """Data class for storing analysis results."""
     file_path: str
@@ -50,24 +72,45 @@ class PythonAnalyzer(CodeAnalyzer):
     
     def __init__(self, config: Optional[Dict] = None):
         self.config = config or {}
-        self.supported_extensions = ['.py', '.pyx', '.pyw']
+        # Files must parse with ast, which rules out Cython (.pyx) sources
+        self.supported_extensions = ['.py', '.pyw']
     
-    def analyze_file(self, file_path: str) -> AnalysisResult:
-        """Analyze a Python file."""
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
+    def analyze_file(self, file_path: str, source: Optional[Source] = None) -> AnalysisResult:
+        """Analyze a Python file.
+        
+        Pass source, as returned by read_source(), to reuse an existing parse.
+        Raises SyntaxError if the file does not parse.
+        """
+        if source is None:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"File not found: {file_path}")
+            source = read_source(file_path)
+        
+        content, tree = source
+        
+        if tree is None:
+            # read_source discards the error; parse again to raise it with its location
+            tree = ast.parse(content, filename=file_path)
+        
+        complexity = 1.0  # Base complexity
+        function_nodes = []
+        class_nodes = []
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                function_nodes.append(node)
+            elif isinstance(node, ast.ClassDef):
+                class_nodes.append(node)
+            elif isinstance(node, _CONTROL_NODES):
+                complexity += 1
         
-        lines = content.split('\n')
-        functions = self._extract_functions(content)
-        classes = self._extract_classes(content)
-        complexity = self._calculate_complexity(content)
+        # ast.walk is breadth-first; report names in source order
+        functions = [n.name for n in sorted(function_nodes, key=_source_position)]
+        classes = [n.name for n in sorted(class_nodes, key=_source_position)]
         
         return AnalysisResult(
             file_path=file_path,
-            lines_of_code=len([line for line in lines if line.strip()]),
+            lines_of_code=sum(1 for _ in _NONBLANK_LINE_RE.finditer(content)),
             functions=functions,
             classes=classes,
             complexity_score=complexity
@@ -76,29 +119,6 @@ class PythonAnalyzer(CodeAnalyzer):
     def get_supported_extensions(self) -> List[str]:
         """Return supported file extensions."""
         return self.supported_extensions
-    
-    def _extract_functions(self, content: str) -> List[str]:
-        """Extract function names from content."""
-        import re
-        pattern = r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*\('
-        return re.findall(pattern, content)
-    
-    def _extract_classes(self, content: str) -> List[str]:
-        """Extract class names from content."""
-        import re
-        pattern = r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)\s*[\(:]'
-        return re.findall(pattern, content)
-    
-    def _calculate_complexity(self, content: str) -> float:
-        """Calculate a simple complexity score."""
-        # Simple complexity based on control structures
-        control_keywords = ['if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally']
-        complexity = 1.0  # Base complexity
-        
-        for keyword in control_keywords:
-            complexity += content.count(f' {keyword} ') + content.count(f'\n{keyword} ')
-        
-        return complexity
 
 
 class ProjectAnalyzer:
@@ -108,26 +128,41 @@ class ProjectAnalyzer:
         self.analyzers = {
             '.py': PythonAnalyzer()
         }
+        self.errors: List[Tuple[str, str]] = []
     
-    def analyze_project(self, project_path: str) -> Dict[str, AnalysisResult]:
-        """Analyze all supported files in a project."""
+    def analyze_project(self, project_path: str, max_workers: Optional[int] = None,
+                        exclude: Collection[str] = DEFAULT_EXCLUDE,
+                        cache: Optional[ResultCache] = None) -> Dict[str, AnalysisResult]:
+        """Analyze all supported files in a project.
+        
+        Directories named in exclude (by default VCS, virtualenv, cache and
+        build directories) are skipped. Files are analyzed in parallel across
+        max_workers processes (default: one per CPU). Files that fail are left
+        out of the results and recorded in self.errors as (file_path, message).
+        With a cache, files whose content is unchanged since the last run
+        reuse their stored results.
+        """
         results = {}
+        errors = []
+        file_paths = list(iter_source_files(project_path, self.analyzers, exclude))
+        outcomes = map_files_incremental(self._analyze_file, file_paths,
+                                         AnalysisResult, cache, max_workers)
         
-        for root, dirs, files in os.walk(project_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file)[1]
-                
-                if ext in self.analyzers:
-                    try:
-                        analyzer = self.analyzers[ext]
-                        result = analyzer.analyze_file(file_path)
-                        results[file_path] = result
-                    except Exception as e:
-                        print(f"Error analyzing {file_path}: {e}")
+        for file_path, result, error in outcomes:
+            if error is None:
+                results[file_path] = result
+            else:
+                errors.append((file_path, error))
+        
+        self.errors = errors
         
         return results
     
+    def _analyze_file(self, file_path: str) -> AnalysisResult:
+        """Analyze one file with the analyzer registered for its extension."""
+        ext = os.path.splitext(file_path)[1]
+        return self.analyzers[ext].analyze_file(file_path)
+    
     def generate_report(self, results: Dict[str, AnalysisResult]) -> str:
         """Generate a summary report."""
         total_files = len(results)
@@ -136,7 +171,7 @@ class ProjectAnalyzer:
         total_classes = sum(len(r.classes) for r in results.values())
         avg_complexity = sum(r.complexity_score for r in results.values()) / total_files if total_files > 0 else 0
         
-        report = f"""
+        header = f"""
 Code Analysis Report
 ===================
 Total Files: {total_files}
@@ -148,14 +183,25 @@ Average Complexity: {avg_complexity:.2f}
 File Details:
 """
         
+        parts: List[str] = [header]
         for file_path, result in results.items():
-            report += f"\n{file_path}:\n"
-            report += f"  Lines: {result.lines_of_code}\n"
-            report += f"  Functions: {', '.join(result.functions) if result.functions else 'None'}\n"
-            report += f"  Classes: {', '.join(result.classes) if result.classes else 'None'}\n"
-            report += f"  Complexity: {result.complexity_score:.2f}\n"
+            parts.append(f"\n{file_path}:\n")
+            parts.append(f"  Lines: {result.lines_of_code}\n")
+            parts.append(f"  Functions: {', '.join(result.functions) if result.functions else 'None'}\n")
+            parts.append(f"  Classes: {', '.join(result.classes) if result.classes else 'None'}\n")
+            parts.append(f"  Complexity: {result.complexity_score:.2f}\n")
         
-        return report
+        return "".join(parts)
+
+
+def write_json(path: str, data: Dict) -> None:
+    """Write data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
 
 def main():
@@ -171,15 +217,19 @@ def main():
         sys.exit(1)
     
     analyzer = ProjectAnalyzer()
-    results = analyzer.analyze_project(project_path)
+    with ResultCache() as cache:
+        results = analyzer.analyze_project(project_path, cache=cache)
     report = analyzer.generate_report(results)
     
     print(report)
     
+    if analyzer.errors:
+        print("Errors:")
+        print("\n".join(f"  {file_path}: {error}" for file_path, error in analyzer.errors))
+    
     # Save results to JSON file
     json_results = {path: result.to_dict() for path, result in results.items()}
-    with open('analysis_results.json', 'w') as f:
-        json.dump(json_results, f, indent=2)
+    write_json('analysis_results.json', json_results)
     
     print("\nResults saved to analysis_results.json")
 
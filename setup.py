@@ -0,0 +1,26 @@
+"""
+Build script for the code analysis tools.
+
+When mypyc is installed, the complexity analyzer is compiled to a C
+extension; otherwise the pure-Python modules are installed unchanged.
+The optional "fast" extra installs orjson for quicker JSON output.
+"""
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = mypycify(["analysis/complexity_analyzer.py"])
+
+setup(
+    name="code-analysis-tools",
+    version="0.1.0",
+    python_requires=">=3.10",
+    py_modules=["code_analyzer"],
+    packages=["analysis"],
+    ext_modules=ext_modules,
+    extras_require={"fast": ["orjson"]},
+)